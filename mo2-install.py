@@ -9,19 +9,20 @@ by scanning for the required DLL in common directories.
 """
 
 import mobase
-import platform
 import logging
-import time
+import logging.handlers
 import threading
 import os
-import re
 import sys
+import struct
 import ctypes
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from mobase import GuessedString
 
-from PyQt6.QtCore import QCoreApplication
+from PyQt6.QtCore import QCoreApplication, QObject, Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QIcon
 from PyQt6.QtWidgets import QFileDialog
 
@@ -36,11 +37,38 @@ logger.setLevel(logging.DEBUG)
 if logger.hasHandlers():
     logger.handlers.clear()
 
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    File handler that coalesces log writes through a large file buffer.
+
+    Unlike `logging.FileHandler`, the stream is not flushed after every record;
+    it is flushed when an error is logged, or on an explicit `flush()`/`close()`.
+    """
+
+    buffer_size = 65536
+
+    def _open(self):
+        """Open the log file with an explicit large write buffer."""
+        return open(self.baseFilename, self.mode, encoding=self.encoding, buffering=self.buffer_size)
+
+    def emit(self, record):
+        """Write a record into the buffer, flushing only for errors."""
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+
 # Configure a default file handler.
 # The log file is created in a 'logs' subdirectory in the current working directory.
 default_log_file = Path.cwd() / r"logs\mo2si.log"
 default_log_file.parent.mkdir(parents=True, exist_ok=True)
-default_handler = logging.FileHandler(str(default_log_file))
+default_handler = BufferedFileHandler(str(default_log_file))
 formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
 default_handler.setFormatter(formatter)
 logger.addHandler(default_handler)
@@ -54,6 +82,30 @@ logger.debug("Logger configured successfully.")
 # Define the callback function type that matches the expected C++ signature.
 CALLBACK_TYPE = ctypes.CFUNCTYPE(None, ctypes.c_char_p)
 
+# Function prototypes for the DLL exports, kept next to the callback type so all
+# C signatures the plugin relies on are declared in one place.
+SET_LOG_CALLBACK_TYPE = ctypes.CFUNCTYPE(None, CALLBACK_TYPE)
+INSTALL_TYPE = ctypes.CFUNCTYPE(ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p)
+
+# ------------------------------------------------------------------------------
+# Mod Name Derivation
+# ------------------------------------------------------------------------------
+# Archive extensions stripped from a file name to derive the mod name.
+ARCHIVE_EXTS = {".7z", ".zip", ".rar", ".fomod", ".001"}
+
+# ------------------------------------------------------------------------------
+# Worker Signals
+# ------------------------------------------------------------------------------
+class InstallSignals(QObject):
+    """
+    Signals emitted by the installation worker thread.
+
+    Lives on the GUI thread so that connected handlers run there, allowing the
+    organizer to be refreshed safely once a mod has been installed.
+    """
+
+    installFinished = pyqtSignal(str)
+
 # ------------------------------------------------------------------------------
 # Plugin Class: InstallMods
 # ------------------------------------------------------------------------------
@@ -70,6 +122,10 @@ class InstallMods(mobase.IPluginTool):
         super(InstallMods, self).__init__()
         self._parentWidget = None  # Reference to the parent GUI widget (if needed)
         self._log_callback = None  # Store the log callback instance to prevent garbage collection
+        self._lib = None  # Loaded DLL handle, cached for the lifetime of the plugin
+        self._install_fn = None  # Bound 'install' function from the DLL
+        self._set_log_callback_fn = None  # Bound 'setLogCallback' function from the DLL
+        self._dll_path_cache = {}  # Resolved DLL paths keyed by DLL name
 
     def init(self, organiser=mobase.IOrganizer, manager=mobase.IInstallationManager):
         """
@@ -84,8 +140,19 @@ class InstallMods(mobase.IPluginTool):
         self.finished = True
         self._organizer = organiser
         self._manager = manager
-        self._queue = []
-        self.handler = None
+        self._queue = deque()
+
+        # Pin a single buffering handler on the logger. Its target is the default log
+        # between installations and the current mod's log file during one.
+        self.handler = logging.handlers.MemoryHandler(capacity=4096, flushLevel=logging.ERROR, target=default_handler)
+        logger.removeHandler(default_handler)
+        logger.addHandler(self.handler)
+
+        # Run DLL installations on a single worker thread so the GUI stays responsive
+        # while installations remain serialized.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mo2si")
+        self._signals = InstallSignals()
+        self._signals.installFinished.connect(self._onInstallFinished, Qt.ConnectionType.QueuedConnection)
 
         # Retrieve the last used download path from plugin settings.
         self.downloadLocation = self._organizer.pluginSetting(self.name(), "LastPath")
@@ -94,119 +161,142 @@ class InstallMods(mobase.IPluginTool):
         logger.info(sys.version)
         logger.info(sys.executable)
         logger.info(os.getcwd())
-        logger.info(platform.architecture())
+        logger.info("%d-bit", struct.calcsize("P") * 8)
 
         # Register the Python log callback with the C++ DLL.
         self.setLog()
+        # Write the start-up records to the default log file right away.
+        self.handler.flush()
+        default_handler.flush()
         return True
 
-    @staticmethod
-    def log_callback(message: bytes):
-        """
-        Callback function to log messages from the C++ DLL.
-
-        Converts the received C-style string (bytes) into a Python string and logs it.
-        """
-        logger.info(message.decode("utf-8"))
-
     def setLog(self):
         """
         Register the Python log callback with the C++ DLL.
 
-        This method loads the DLL, sets up the function signature for the log callback,
-        and registers the callback function with the DLL. It also saves the callback
-        reference to prevent it from being garbage-collected.
+        This method loads the DLL (once), registers the callback function with it
+        and saves the callback reference to prevent it from being garbage-collected.
+        The callback is invoked for every line of installer output, so the bound
+        `logger.info` method is resolved here once rather than per message.
         """
+        info = logger.info
+
+        def log_callback(message: bytes):
+            # Convert the received C-style string (bytes) into a Python string and log it.
+            info(message.decode("utf-8", "replace"))
+
         try:
             # Create a callback instance with the defined function signature.
-            c_callback = CALLBACK_TYPE(InstallMods.log_callback)
-            dll_path = self.find_dll()
-            logger.info("Setting log callback using DLL: " + str(dll_path))
-
-            # Load the DLL using ctypes.
-            lib = ctypes.CDLL(str(dll_path))
-            # Define the expected argument and return types for the setLogCallback function.
-            lib.setLogCallback.argtypes = [CALLBACK_TYPE]
-            lib.setLogCallback.restype = None
+            c_callback = CALLBACK_TYPE(log_callback)
+            self._load_dll()
             # Register the callback with the DLL.
-            lib.setLogCallback(c_callback)
+            self._set_log_callback_fn(c_callback)
             # Retain a reference to the callback to avoid garbage collection.
             self._log_callback = c_callback
             logger.debug("Log callback registered successfully.")
         except Exception as e:
-            logger.error("Failed to set log callback: " + str(e))
+            logger.error("Failed to set log callback: %s", e)
+
+    def _load_dll(self):
+        """
+        Load the installer DLL and bind its exported functions.
+
+        The plugin always uses the single 'mo2-installer.dll'. It is located and
+        loaded only on the first call; the handle and the configured function
+        objects are cached on the instance and reused for every subsequent installation.
+
+        Returns:
+            The loaded `ctypes.CDLL` handle.
+
+        Raises:
+            FileNotFoundError: If the DLL cannot be found.
+        """
+        if self._lib is None:
+            dll_path = self.find_dll()
+            logger.info("Using DLL: %s", dll_path)
+            lib = ctypes.CDLL(str(dll_path))
+
+            # Bind the exports to their prototypes once.
+            self._set_log_callback_fn = SET_LOG_CALLBACK_TYPE(("setLogCallback", lib))
+            self._install_fn = INSTALL_TYPE(("install", lib))
+            self._lib = lib
+        return self._lib
+
+    @staticmethod
+    def _dll_candidates(dll_name):
+        """
+        Yield candidate DLL paths lazily, most likely locations first.
+        """
+        cwd = os.getcwd()
+        yield os.path.join(os.path.dirname(os.path.abspath(__file__)), dll_name)  # Bundled with this script
+        yield os.path.join(cwd, "dlls", "mo2si", dll_name)  # Specific DLL subdirectory for Mo2
+        yield os.path.join(cwd, dll_name)  # Current working directory
+        for p in os.environ.get("PATH", "").split(os.pathsep):  # System PATH directories
+            if p:
+                yield os.path.join(p, dll_name)
 
     def find_dll(self, dll_name="mo2-installer.dll"):
         """
         Locate the required DLL for installation.
 
-        Searches for the DLL in several common locations:
-          - The current working directory.
-          - A subdirectory 'dlls/mo2si' in the current working directory.
+        Searches for the DLL in several common locations, in this order:
           - The directory where this script is located.
+          - A subdirectory 'dlls/mo2si' in the current working directory.
+          - The current working directory.
           - Directories listed in the system PATH.
 
+        The first successful lookup is cached per DLL name, and the search stops at
+        the first hit.
+
         Returns:
             The resolved path to the DLL.
 
         Raises:
             FileNotFoundError: If the DLL cannot be found.
         """
-        logger.info("Current path: " + str(Path.cwd()))
-        search_paths = [
-            Path.cwd(),  # Current working directory
-            Path(Path.cwd() / r"dlls\mo2si"),  # Specific DLL subdirectory for Mo2
-            Path(__file__).parent,  # Directory where this script is located
-            *[Path(p) for p in os.getenv("PATH", "").split(os.pathsep) if Path(p).exists()]  # System PATH directories
-        ]
+        if dll_name in self._dll_path_cache:
+            return self._dll_path_cache[dll_name]
 
-        for path in search_paths:
-            dll_path = path / dll_name
-            if dll_path.exists():
-                return dll_path.resolve()
+        logger.info("Current path: %s", Path.cwd())
+        for candidate in self._dll_candidates(dll_name):
+            # A single stat per candidate; missing directories simply fail the check.
+            if os.path.isfile(candidate):
+                self._dll_path_cache[dll_name] = Path(candidate).resolve()
+                return self._dll_path_cache[dll_name]
 
         raise FileNotFoundError(f"Could not find {dll_name} in common locations.")
 
-    def install(self, archive_path: str, install_path: str, dll_name="mo2-installer.dll") -> str:
+    def install(self, archive_path: str, install_path: str) -> str:
         """
         Call the DLL's 'Install' function to perform a mod installation.
 
-        Validates the existence of both the archive and installation paths,
-        then calls the install function from the DLL.
+        Calls the cached install function from 'mo2-installer.dll'. Missing paths are not
+        probed up front; the DLL reports them through its returned status string.
 
         Args:
             archive_path (str): The path to the mod archive.
             install_path (str): The target installation directory.
-            dll_name (str): Name of the DLL file to use.
 
         Returns:
-            str: The output from the DLL function, decoded to a Python string.
+            str: The output from the DLL function (the installation path), decoded to a Python string.
 
         Raises:
-            FileNotFoundError: If either the archive or installation path does not exist.
+            RuntimeError: If the DLL reports an error, e.g. a missing or unreadable archive.
         """
-        dll_path = self.find_dll(dll_name)
-        logger.info("Using DLL: " + str(dll_path))
-        lib = ctypes.CDLL(str(dll_path))
+        self._load_dll()
 
-        # Define the expected function signature for install.
-        lib.install.argtypes = [ctypes.c_char_p, ctypes.c_char_p]
-        lib.install.restype = ctypes.c_char_p  # Expecting a C string as output
+        # Encode paths to bytes once; the prototype passes bytes as `char*` directly.
+        # The DLL takes narrow `const char*` paths, so `c_wchar_p` is not an option.
+        archive_bytes = os.fsencode(archive_path)
+        install_bytes = os.fsencode(install_path)
+        result = self._install_fn(archive_bytes, install_bytes)
 
-        archive_path = Path(archive_path)
-        if not archive_path.exists():
-            raise FileNotFoundError(f"Archive file not found: {archive_path}")
+        # On success the DLL echoes the installation path; anything else is an error message.
+        if result != install_bytes:
+            raise RuntimeError(f"Installation failed: {result.decode('utf-8', 'replace')}")
 
-        install_path = Path(install_path)
-        if not install_path.exists():
-            raise FileNotFoundError(f"Mod file not found: {install_path}")
-
-        # Encode paths to bytes for the C function.
-        archive_path_encoded = str(archive_path).encode("utf-8")
-        install_path_encoded = str(install_path).encode("utf-8")
-        result = lib.install(ctypes.c_char_p(archive_path_encoded), ctypes.c_char_p(install_path_encoded))
-
-        return result.decode("utf-8")  # Convert the returned C string to a Python string
+        # The echoed bytes equal the input, so return the caller's string without decoding.
+        return install_path
 
     # ------------------------------------------------------------------------------
     # Plugin Metadata and UI Methods
@@ -258,16 +348,19 @@ class InstallMods(mobase.IPluginTool):
         Open a file dialog for the user to select mod archive files.
 
         Saves the chosen directory to the plugin settings and initiates the installation queue.
+        Selected archives are appended, so a batch that is still installing keeps its
+        pending items.
         """
-        self._queue = QFileDialog.getOpenFileNames(
+        files = QFileDialog.getOpenFileNames(
             self._parentWidget,
             "Open File",
             self.downloadLocation,
             "Mod Archives (*.001 *.7z *.fomod *.zip *.rar)",
         )[0]
-        if len(self._queue) > 0:
+        if len(files) > 0:
+            self._queue.extend(files)
             # Update the last used download location based on the first selected file.
-            pathGet = self._queue[0]
+            pathGet = files[0]
             self.downloadLocation = os.path.split(os.path.abspath(pathGet))[0]
             self._organizer.setPluginSetting(self.name(), "LastPath", self.downloadLocation)
 
@@ -292,42 +385,49 @@ class InstallMods(mobase.IPluginTool):
         If debug mode is enabled, prints a log message with an incrementing counter.
         """
         if self.debug:
-            print("Install Multiple Mods log" + str(self.num) + ": " + string)
+            print(f"Install Multiple Mods log{self.num}: {string}")
             self.num += 1
 
     def _configure_mod_logger(self, mod_dir: Path):
         """
         Reconfigure the logger to write into a mod-specific log file.
 
-        This method creates (or reuses) an 'mo2si-install.log' file in the mod directory,
-        and sets up a new file handler so that subsequent logs are directed there.
+        This method creates (or reuses) an 'mo2si-install.log' file in the mod directory
+        and points the pinned memory handler at it, so that subsequent logs are directed
+        there and written in one batch when the installation finishes (or when an
+        error is logged). The handlers attached to the logger are left untouched.
 
         Args:
             mod_dir (Path): The directory of the mod being installed.
         """
         mod_log_file = mod_dir / "mo2si-install.log"
         mod_log_file.parent.mkdir(parents=True, exist_ok=True)
-        # Remove all current handlers.
-        for handler in logger.handlers[:]:
-            logger.removeHandler(handler)
-        # Create a new file handler for the mod log file.
-        mod_handler = logging.FileHandler(str(mod_log_file))
-        mod_handler.setFormatter(formatter)
-        logger.addHandler(mod_handler)
-        logger.info("Logger reconfigured for mod directory: " + str(mod_dir))
+        # Write out records still buffered for the default log.
+        self.handler.flush()
+        default_handler.flush()
+        # Create a new file handler for the mod log file and swap it in as the target.
+        target = BufferedFileHandler(str(mod_log_file))
+        target.setFormatter(formatter)
+        self.handler.setTarget(target)
+        logger.info("Logger reconfigured for mod directory: %s", mod_dir)
 
     def _close_logger(self):
         """
-        Close and flush all logger handlers.
+        Flush and close the mod log file.
 
-        This method is used to ensure that all log files are properly written and closed
-        after a mod installation is complete.
+        This method is used to ensure that the mod log file is properly written and closed
+        after a mod installation is complete. Logging falls back to the default log.
         """
-        for handler in logger.handlers[:]:
-            handler.flush()
-            handler.close()
-            logger.removeHandler(handler)
-        logger.debug("Logger handlers closed.")
+        # Drain buffered records into the mod log file in one batch.
+        self.handler.flush()
+        target = self.handler.target
+        self.handler.setTarget(default_handler)
+        if target is not default_handler:
+            target.close()
+        logger.debug("Mod log file closed.")
+        # Write records logged since the last installation to the default log file.
+        self.handler.flush()
+        default_handler.flush()
 
     def _installQueue(self):
         """
@@ -335,39 +435,83 @@ class InstallMods(mobase.IPluginTool):
 
         If there are mod archive files in the queue and no installation is running,
         this method pops the next archive, prepares its mod name, creates a mod entry,
-        reconfigures the logger for that mod, and calls the installation method.
-        After installation, it refreshes the organizer and proceeds with the next item.
+        reconfigures the logger for that mod, and hands the installation to the
+        worker thread. `_onInstallFinished` continues with the next item, so the
+        queue is drained iteratively without any stack growth. Archives that cannot
+        be set up are logged and skipped.
         """
-        if self.finished and len(self._queue) != 0:
-            self.finished = False
-            path = self._queue.pop(0)
-            base_name = os.path.basename(path)
-            # Remove file extensions to derive a clean mod name.
-            while '.' in base_name:
-                base_name = os.path.splitext(base_name)[0]
-            # Remove any leading digits or underscores/hyphens.
-            base_name = re.sub(r'^\d+[-_]', '', base_name)
+        if not self.finished or not self._queue:
+            return
 
-            # Create a new mod entry in the organizer.
+        self.finished = False
+        path = self._queue.popleft()
+        try:
+            base_name = os.path.basename(path)
+            # Remove archive extensions to derive a clean mod name, keeping any
+            # periods that are part of the name itself (e.g. "SkyUI_5.2SE").
+            while (ext := os.path.splitext(base_name)[1].lower()) in ARCHIVE_EXTS:
+                base_name = base_name[:-len(ext)]
+            # Remove a leading numeric prefix followed by an underscore/hyphen (e.g. "123-").
+            i = 0
+            while i < len(base_name) and base_name[i].isdecimal():
+                i += 1
+            if 0 < i < len(base_name) and base_name[i] in "-_":
+                base_name = base_name[i + 1:]
+
+            # Create a new mod entry in the organizer. MO2 returns None when the mod
+            # already exists and the user declines to overwrite it.
             mod = self._organizer.createMod(base_name)
+            if mod is None:
+                logger.info("Skipping archive, mod was not created: %s", path)
+                self.finished = True
+                QTimer.singleShot(0, self._installQueue)
+                return
+
             mod_dir = Path(mod.absolutePath())
             self._configure_mod_logger(mod_dir)
 
-            logger.info("Starting installation for mod: " + base_name)
-            # Call the installation function from the DLL.
-            path = self.install(path, mod.absolutePath())
-            self._organizer.refresh()
-            logger.info("Finished installation for mod: " + base_name)
-
+            logger.info("Starting installation for mod: %s", base_name)
+            # Call the installation function from the DLL off the GUI thread.
+            self._executor.submit(self._installWorker, path, mod.absolutePath(), base_name)
+        except Exception as e:
+            # This runs from Qt slots, so errors must not escape; skip the archive
+            # and keep the rest of the queue going.
+            logger.error("Failed to start installation for %s: %s", path, e)
             self._close_logger()
-            time.sleep(0.2)
             self.finished = True
-            self._installQueue()
+            QTimer.singleShot(0, self._installQueue)
 
-        elif len(self._queue) == 0:
-            self.finished = True
+    def _installWorker(self, archive_path: str, install_path: str, mod_name: str):
+        """
+        Run a single installation on the worker thread.
 
-        return
+        Errors are logged to the mod log; completion is always reported back to
+        the GUI thread through the `installFinished` signal.
+        """
+        try:
+            self.install(archive_path, install_path)
+        except Exception as e:
+            logger.error("Installation failed for mod %s: %s", mod_name, e)
+        self._signals.installFinished.emit(mod_name)
+
+    def _onInstallFinished(self, mod_name: str):
+        """
+        Finish a mod installation on the GUI thread.
+
+        Refreshes the organizer, closes the mod log and schedules the next item.
+        The next installation starts from a fresh event loop iteration, so any
+        events posted by the refresh are processed first without a fixed delay.
+        `_installQueue` handles its own errors, so it is safe to schedule directly.
+        """
+        try:
+            self._organizer.refresh()
+            logger.info("Finished installation for mod: %s", mod_name)
+        except Exception as e:
+            logger.error("Failed to refresh after installing mod %s: %s", mod_name, e)
+        finally:
+            self._close_logger()
+            self.finished = True
+            QTimer.singleShot(0, self._installQueue)
 
 # ------------------------------------------------------------------------------
 # Plugin Factory Function
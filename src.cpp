@@ -342,10 +342,12 @@ bool areDependenciesMet(const pugi::xml_node& dependenciesNode) {
     *   multiple candidates exist. Falls back to copying the archive root.
     * - Copies the final output into the provided mod directory.
     *
-    * @param archivePath Path to the input archive file.
+    * @param archivePath Path to the input archive file (narrow string, as
+    *        produced by Python's `os.fsencode`).
     * @param modPath Destination mod directory where files are installed.
     * @return On success, pointer to a static string containing the destination
-    *         path. On error, pointer to a static string describing the error.
+    *         path, byte-for-byte equal to `modPath`. On error, pointer to a
+    *         static string describing the error.
     * @note Designed for use via Python `ctypes`; the returned pointer remains
     *       valid after the call because it points to a static buffer.
     */
@@ -637,7 +639,9 @@ bool areDependenciesMet(const pugi::xml_node& dependenciesNode) {
          catch (const std::exception& e) {
              log(std::format("Fatal error: {}", std::string(e.what())));
              CloseConsoleIfOwned();
-             return e.what();
+             // Copy the message: the exception is destroyed when the handler exits.
+             outputPath = e.what();
+             return outputPath.c_str();
          }
      }
  }